@@ -0,0 +1,268 @@
+"""Py4AI learning-cohort grouping over assessments."""
+import hashlib
+import json
+import threading
+import zlib
+
+import numpy as np
+
+from storage import ASSESSMENTS_FILE, STORAGE_LOCK, load_json_list, write_json_atomic
+
+# Ordered answer scales shared by the form and the cohort engine
+PYTHON_LEVEL_OPTIONS = ["Never used", "Basic scripts", "Comfortable", "Intermediate", "Advanced"]
+STUDY_TIME_OPTIONS = ["<5 hours", "5-10 hours", "10-20 hours", "20-30 hours", "Full-time learning"]
+PYTHON_AI_INTEREST_OPTIONS = ["Not interested", "Curious", "Definitely want to learn", "Priority skill"]
+PY4AI_COURSE_INTEREST_OPTIONS = ["Not sure what this is", "Sounds interesting", "Would definitely take", "Perfect for my needs"]
+TIMELINE_PREFERENCE_OPTIONS = ["3-Month Sprint", "6-Month Strategic", "12-Month Mastery", "18+ Month Evolution"]
+
+COHORTS_FILE = "engineer_ai_cohorts.json"
+# Serializes grouping runs against each other, independently of STORAGE_LOCK
+COHORTS_LOCK = threading.Lock()
+COHORT_TARGET_SIZE = 25
+COHORT_KMEANS_ITERATIONS = 10
+# Caps on clustering cost: rows used to fit k-means, nearest cohorts kept per
+# row for the greedy pass, and rows per block of distance computation
+COHORT_KMEANS_SAMPLE = 4096
+COHORT_CANDIDATES = 16
+COHORT_DISTANCE_CHUNK = 2048
+
+# Feature name -> (section, field, ordered options) in the assessment record
+COHORT_ORDINAL_FEATURES = {
+    "python_ai_interest": ("py4ai_interest", "python_ai_interest", PYTHON_AI_INTEREST_OPTIONS),
+    "py4ai_course_interest": ("py4ai_interest", "py4ai_course_interest", PY4AI_COURSE_INTEREST_OPTIONS),
+    "timeline_preference": ("learning_preferences", "timeline_preference", TIMELINE_PREFERENCE_OPTIONS),
+    "study_time": ("learning_preferences", "study_time", STUDY_TIME_OPTIONS),
+    "python_level": ("technical_background", "python_level", PYTHON_LEVEL_OPTIONS),
+}
+
+# Free-text locations are hashed into a fixed number of one-hot buckets
+COHORT_LOCATION_BUCKETS = 32
+COHORT_LOCATION_WEIGHT = 1.0
+COHORT_FEATURE_DIMS = len(COHORT_ORDINAL_FEATURES) + COHORT_LOCATION_BUCKETS
+
+def cohort_applicant_key(assessment_data):
+    """Stable applicant id, so resubmissions keep their existing cohort.
+
+    Keyed by email, else timestamp; a record with neither is keyed by a hash
+    of its contents so such records do not collapse onto one applicant.
+    """
+    email = ((assessment_data.get('personal_info') or {}).get('email') or '').strip().lower()
+    if email:
+        return email
+    if assessment_data.get('timestamp'):
+        return assessment_data['timestamp']
+    content = json.dumps(assessment_data, sort_keys=True, ensure_ascii=False)
+    return f"anonymous:{hashlib.sha1(content.encode('utf-8')).hexdigest()}"
+
+def cohort_features(assessments):
+    """Encode assessments as an (n, COHORT_FEATURE_DIMS) float32 matrix.
+
+    Ordinal answers are scaled to [0, 1] (unknown answers sit at the midpoint);
+    the city part of the location is one-hot encoded into hashed buckets.
+    """
+    X = np.zeros((len(assessments), COHORT_FEATURE_DIMS), dtype=np.float32)
+    for row, assessment_data in enumerate(assessments):
+        for col, (section, field, options) in enumerate(COHORT_ORDINAL_FEATURES.values()):
+            value = (assessment_data.get(section) or {}).get(field)
+            X[row, col] = options.index(value) / (len(options) - 1) if value in options else 0.5
+        location = (assessment_data.get('personal_info') or {}).get('location', '')
+        city = location.split(',')[0].strip().lower()
+        if city:
+            bucket = zlib.crc32(city.encode('utf-8')) % COHORT_LOCATION_BUCKETS
+            X[row, len(COHORT_ORDINAL_FEATURES) + bucket] = COHORT_LOCATION_WEIGHT
+    return X
+
+def _squared_distances(X, centroids):
+    """(n, k) squared Euclidean distances, without materializing (n, k, d)"""
+    distances = (
+        (X * X).sum(axis=1)[:, None]
+        - 2.0 * X @ centroids.T
+        + (centroids * centroids).sum(axis=1)[None, :]
+    )
+    return np.maximum(distances, 0.0)
+
+def _nearest_candidates(X, centroids, m):
+    """Indices and distances of the m nearest centroids per row, nearest first.
+
+    Distances are computed COHORT_DISTANCE_CHUNK rows at a time so memory
+    stays bounded no matter how many rows and centroids there are.
+    """
+    k = len(centroids)
+    m = min(m, k)
+    indices = np.empty((len(X), m), dtype=np.int64)
+    distances = np.empty((len(X), m), dtype=np.float32)
+    for start in range(0, len(X), COHORT_DISTANCE_CHUNK):
+        chunk = _squared_distances(X[start:start + COHORT_DISTANCE_CHUNK], centroids)
+        nearest = np.argpartition(chunk, m - 1, axis=1)[:, :m] if m < k else np.tile(np.arange(k), (len(chunk), 1))
+        nearest_distances = np.take_along_axis(chunk, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        indices[start:start + len(chunk)] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:start + len(chunk)] = np.take_along_axis(nearest_distances, order, axis=1)
+    return indices, distances
+
+def _kmeans_centroids(X, weights, k, iterations=COHORT_KMEANS_ITERATIONS, seed=0):
+    """Weighted vectorized k-means over unique feature rows; only used to seed cohort centroids.
+
+    Fitting uses at most COHORT_KMEANS_SAMPLE rows (drawn by weight), so the
+    cost is capped however large the archive grows.
+    """
+    rng = np.random.default_rng(seed)
+    probabilities = weights / weights.sum()
+    if len(X) > COHORT_KMEANS_SAMPLE:
+        sample = rng.choice(len(X), size=COHORT_KMEANS_SAMPLE, replace=False, p=probabilities)
+        X, weights = X[sample], weights[sample]
+        probabilities = weights / weights.sum()
+    centroids = X[rng.choice(len(X), size=k, replace=k > len(X), p=probabilities)].copy()
+    for _ in range(iterations):
+        labels = _nearest_candidates(X, centroids, 1)[0][:, 0]
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, X * weights[:, None])
+        totals = np.bincount(labels, weights=weights, minlength=k)
+        filled = totals > 0
+        centroids[filled] = sums[filled] / totals[filled, None]
+    return centroids
+
+def _balanced_assign(X, inverse, counts, centroids, capacity):
+    """Greedily assign each applicant to its nearest centroid that still has room.
+
+    Works on the unique feature rows X (applicant i has row inverse[i], and
+    counts[r] applicants share row r). Rows with the most to lose from missing
+    their first choice (largest gap between best and second-best distance) are
+    placed first; only the COHORT_CANDIDATES nearest centroids are kept per
+    row, falling back to a full scan for the rare row whose candidates are full.
+    """
+    capacity = capacity.copy()
+    candidates, distances = _nearest_candidates(X, centroids, COHORT_CANDIDATES)
+    if distances.shape[1] > 1:
+        order = np.argsort(distances[:, 0] - distances[:, 1], kind='stable')
+    else:
+        order = np.arange(len(X))
+    members_by_row = np.split(np.argsort(inverse, kind='stable'), np.cumsum(counts)[:-1])
+    labels = np.empty(len(inverse), dtype=np.int64)
+    for row in order:
+        members = members_by_row[row]
+        placed = 0
+        for choices in (candidates[row], None):
+            if choices is None:
+                open_cohorts = np.flatnonzero(capacity > 0)
+                choices = open_cohorts[np.argsort(_squared_distances(X[row:row + 1], centroids[open_cohorts])[0])]
+            for j in choices:
+                take = min(len(members) - placed, capacity[j])
+                if take > 0:
+                    labels[members[placed:placed + take]] = j
+                    capacity[j] -= take
+                    placed += take
+                if placed == len(members):
+                    break
+            if placed == len(members):
+                break
+    return labels
+
+def empty_cohorts(target_size=COHORT_TARGET_SIZE):
+    """Return an empty cohort grouping state"""
+    return {"target_size": target_size, "feature_dims": COHORT_FEATURE_DIMS, "next_id": 1, "cohorts": []}
+
+def assign_cohorts(assessments, state=None, target_size=COHORT_TARGET_SIZE):
+    """Place applicants not yet in a cohort, keeping existing assignments.
+
+    New applicants first fill open seats in existing cohorts (up to target_size);
+    any overflow seeds new cohorts via k-means. Each cohort keeps a running
+    feature sum so its centroid follows its members without re-encoding them.
+    Pass state=None to group everyone from scratch. A state saved with a
+    different target size or feature layout raises ValueError rather than
+    silently discarding its assignments.
+    """
+    if state is None:
+        state = empty_cohorts(target_size)
+    elif state.get("target_size") != target_size:
+        raise ValueError(
+            f"Saved cohorts use target size {state.get('target_size')}, not {target_size}; "
+            "regroup from scratch to change it"
+        )
+    elif state.get("feature_dims") != COHORT_FEATURE_DIMS:
+        raise ValueError("Saved cohorts use a different feature layout; regroup from scratch")
+
+    # Latest submission per applicant wins
+    applicants = {}
+    for assessment_data in assessments:
+        applicants[cohort_applicant_key(assessment_data)] = assessment_data
+    assigned = {key for cohort in state["cohorts"] for key in cohort["members"]}
+    new_keys = [key for key in applicants if key not in assigned]
+    if not new_keys:
+        return state
+
+    X = cohort_features([applicants[key] for key in new_keys])
+    # Answers are categorical, so many applicants share a feature row
+    unique_rows, inverse, counts = np.unique(X, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    cohorts = state["cohorts"]
+    if cohorts:
+        sums = np.array([cohort["feature_sum"] for cohort in cohorts], dtype=np.float32)
+        sizes = np.array([len(cohort["members"]) for cohort in cohorts])
+        centroids = sums / np.maximum(sizes, 1)[:, None]
+        capacity = np.maximum(target_size - sizes, 0)
+    else:
+        centroids = np.zeros((0, COHORT_FEATURE_DIMS), dtype=np.float32)
+        capacity = np.zeros(0, dtype=np.int64)
+
+    overflow = len(new_keys) - int(capacity.sum())
+    if overflow > 0:
+        k = -(-overflow // target_size)
+        centroids = np.vstack([centroids, _kmeans_centroids(unique_rows, counts.astype(np.float32), k)])
+        capacity = np.concatenate([capacity, np.full(k, -(-overflow // k))])
+        for _ in range(k):
+            cohorts.append({
+                "id": f"cohort-{state['next_id']:03d}",
+                "feature_sum": [0.0] * COHORT_FEATURE_DIMS,
+                "members": [],
+            })
+            state["next_id"] += 1
+
+    labels = _balanced_assign(unique_rows, inverse, counts, centroids, capacity)
+    sums = np.array([cohort["feature_sum"] for cohort in cohorts], dtype=np.float64)
+    np.add.at(sums, labels, X)
+    for key, label in zip(new_keys, labels):
+        cohorts[label]["members"].append(key)
+    for cohort, feature_sum in zip(cohorts, sums):
+        cohort["feature_sum"] = feature_sum.round(6).tolist()
+    state["cohorts"] = [cohort for cohort in cohorts if cohort["members"]]
+    return state
+
+def load_cohorts():
+    """Read the saved cohort grouping, or None if it has never been run"""
+    try:
+        with open(COHORTS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def run_cohort_grouping(rebuild=False, target_size=COHORT_TARGET_SIZE):
+    """Batch entry point: group the archive incrementally (or from scratch with rebuild=True) and save.
+
+    The storage lock is only held to snapshot the archive, so submissions are
+    not blocked while grouping runs; COHORTS_LOCK serializes grouping runs.
+    """
+    with COHORTS_LOCK:
+        with STORAGE_LOCK:
+            assessments = load_json_list(ASSESSMENTS_FILE)
+        state = None if rebuild else load_cohorts()
+        state = assign_cohorts(assessments, state, target_size)
+        write_json_atomic(COHORTS_FILE, state)
+    return state
+
+def cohort_roster(state, assessments):
+    """One row per member: (cohort id, name, email, location), from each applicant's latest submission"""
+    applicants = {}
+    for assessment_data in assessments:
+        applicants[cohort_applicant_key(assessment_data)] = assessment_data
+    rows = []
+    for cohort in state["cohorts"]:
+        for key in cohort["members"]:
+            personal_info = (applicants.get(key) or {}).get('personal_info') or {}
+            rows.append((
+                cohort["id"],
+                personal_info.get('name', ''),
+                personal_info.get('email', key),
+                personal_info.get('location', '')
+            ))
+    return rows
@@ -1,11 +1,13 @@
 import streamlit as st
-import json
-import os
 from datetime import datetime
 import pandas as pd
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from storage import ASSESSMENTS_FILE, load_json_list, load_stats, save_assessment
+from cohorts import (
+    PYTHON_LEVEL_OPTIONS, STUDY_TIME_OPTIONS, TIMELINE_PREFERENCE_OPTIONS,
+    PYTHON_AI_INTEREST_OPTIONS, PY4AI_COURSE_INTEREST_OPTIONS,
+    load_cohorts, run_cohort_grouping, cohort_roster
+)
+from notifications import DEAD_LETTER_FILE, NotificationHub, build_notifiers
 
 # Set page config
 st.set_page_config(
@@ -14,126 +16,28 @@ st.set_page_config(
     layout="wide"
 )
 
-# EMAIL NOTIFICATION FUNCTION
-def send_email_notification(assessment_data):
-    """Send email notification when engineer assessment is completed"""
+# NOTIFICATIONS
+def _secrets_section(section):
     try:
-        # Get email credentials from Streamlit secrets
-        sender_email = st.secrets["email"]["sender"]
-        sender_password = st.secrets["email"]["password"]
-        receiver_email = st.secrets["email"]["receiver"]
-        
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = receiver_email
-        msg['Subject'] = f"🔧 New Engineer AI Pivot Assessment: {assessment_data['personal_info']['name']}"
-        
-        # Create email body
-        body = f"""
-====================================
-ENGINEER AI PIVOT - NEW ASSESSMENT
-====================================
-
-CONTACT INFORMATION
------------------------------------
-Name:          {assessment_data['personal_info']['name']}
-Email:         {assessment_data['personal_info']['email']}
-LinkedIn:      {assessment_data['personal_info'].get('linkedin', 'Not provided')}
-Location:      {assessment_data['personal_info'].get('location', 'Not provided')}
-
-ENGINEERING BACKGROUND
------------------------------------
-Discipline:       {assessment_data['personal_info']['engineering_discipline']}
-Experience:       {assessment_data['personal_info']['years_experience']}
-Previous Title:   {assessment_data['personal_info']['previous_title']}
-Company/Industry: {assessment_data['personal_info']['company_industry']}
-
-CURRENT SITUATION
------------------------------------
-Layoff Timeline:     {assessment_data['personal_info']['layoff_date']}
-Financial Runway:    {assessment_data['personal_info']['financial_runway']}
-Employment Status:   {assessment_data['situation']['employment_status']}
-Job Timeline:        {assessment_data['situation']['job_timeline']}
-Urgency Level:       {assessment_data['situation']['urgency_level']}
-
-CAREER PATH
------------------------------------
-Selected Path: {assessment_data['use_case']['selected']}
-
-TECHNICAL BACKGROUND
------------------------------------
-Programming Exp:   {assessment_data['technical_background']['programming_exp']}
-Python Level:      {assessment_data['technical_background']['python_level']}
-Languages Known:   {', '.join(assessment_data['technical_background']['programming_languages'])}
-Data Analysis:     {assessment_data['technical_background']['data_analysis_exp']}
-Math Comfort:      {assessment_data['technical_background']['math_comfort']}
-
-AI KNOWLEDGE
------------------------------------
-AI Understanding:  {assessment_data['ai_knowledge']['ai_understanding']}
-AI Tools Used:     {', '.join(assessment_data['ai_knowledge']['ai_tools_used'])}
-AI Interests:      {', '.join(assessment_data['ai_knowledge']['ai_interests'])}
-Biggest Concern:   {assessment_data['ai_knowledge']['biggest_concern']}
-
-LEARNING PREFERENCES
------------------------------------
-Study Time:        {assessment_data['learning_preferences']['study_time']}
-Timeline:          {assessment_data['learning_preferences']['timeline_preference']}
-Learning Formats:  {', '.join(assessment_data['learning_preferences']['learning_formats'])}
-Video Preference:  {assessment_data['learning_preferences']['video_preference']}
-Hands-on Style:    {assessment_data['learning_preferences']['hands_on_style']}
+        return dict(st.secrets[section])
+    except Exception:
+        return {}
 
-PY4AI INTEREST ⭐
------------------------------------
-Python AI Interest:  {assessment_data['py4ai_interest']['python_ai_interest']}
-Py4AI Course:        {assessment_data['py4ai_interest']['py4ai_course_interest']}
-
-CAREER GOALS
------------------------------------
-Motivation:          {assessment_data['career_goals']['pivot_motivation']}
-Target Roles:        {', '.join(assessment_data['career_goals']['target_roles'])}
-Income Expectations: {assessment_data['career_goals']['income_expectations']}
-Industry Target:     {assessment_data['career_goals']['industry_target']}
-
-RESOURCES
------------------------------------
-Learning Budget:     {assessment_data['resources']['learning_budget']}
-Equipment Status:    {assessment_data['resources']['equipment_status']}
-Home Environment:    {assessment_data['resources']['home_environment']}
-Family Support:      {assessment_data['resources']['family_support']}
-
-OPEN RESPONSES
------------------------------------
-Biggest Challenge:
-{assessment_data['open_responses']['biggest_challenge']}
-
-Most Exciting Opportunity:
-{assessment_data['open_responses']['most_exciting']}
-
-Ideal 12-Month Outcome:
-{assessment_data['open_responses']['ideal_outcome']}
-
-TIMESTAMP
------------------------------------
-{assessment_data['timestamp']}
+@st.cache_resource
+def load_notification_hub():
+    """One hub (and its connection pools) shared across sessions and reruns"""
+    notification_settings = _secrets_section("notifications")
+    return NotificationHub(
+        build_notifiers(_secrets_section("email"), notification_settings),
+        dead_letter_file=notification_settings.get("dead_letter_file", DEAD_LETTER_FILE)
+    )
 
-====================================
-FULL DATA (JSON)
-====================================
-{json.dumps(assessment_data, indent=2)}
-"""
-        
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Send email
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
-        
-        return True
-    except Exception as e:
-        st.error(f"Failed to send email notification: {str(e)}")
+# ADMIN WIDGETS
+def admin_widget_enabled(flag):
+    """Admin sidebar widgets are opt-in via st.secrets["admin"][flag] (show_stats, show_cohorts)"""
+    try:
+        return bool(st.secrets["admin"][flag])
+    except Exception:
         return False
 
 # Define engineer use cases with detailed information
@@ -351,7 +255,7 @@ with st.form("engineer_ai_assessment"):
         
         python_level = st.select_slider(
             "Python Experience Level",
-            options=["Never used", "Basic scripts", "Comfortable", "Intermediate", "Advanced"],
+            options=PYTHON_LEVEL_OPTIONS,
             value="Never used"
         )
     
@@ -405,7 +309,7 @@ with st.form("engineer_ai_assessment"):
     with col1:
         study_time = st.selectbox(
             "Available Study Time per Week",
-            ["<5 hours", "5-10 hours", "10-20 hours", "20-30 hours", "Full-time learning"]
+            STUDY_TIME_OPTIONS
         )
         
         learning_formats = st.multiselect(
@@ -415,7 +319,7 @@ with st.form("engineer_ai_assessment"):
         
         timeline_preference = st.selectbox(
             "Preferred Timeline",
-            ["3-Month Sprint", "6-Month Strategic", "12-Month Mastery", "18+ Month Evolution"]
+            TIMELINE_PREFERENCE_OPTIONS
         )
     
     with col2:
@@ -497,13 +401,13 @@ with st.form("engineer_ai_assessment"):
     with col1:
         python_ai_interest = st.select_slider(
             "Interest in 'Python for AI' Learning",
-            options=["Not interested", "Curious", "Definitely want to learn", "Priority skill"],
+            options=PYTHON_AI_INTEREST_OPTIONS,
             value="Curious"
         )
         
         py4ai_course_interest = st.selectbox(
             "Dr. C's Py4AI Course Interest",
-            ["Not sure what this is", "Sounds interesting", "Would definitely take", "Perfect for my needs"]
+            PY4AI_COURSE_INTEREST_OPTIONS
         )
     
     with col2:
@@ -634,35 +538,28 @@ if submitted:
             }
         }
         
-        # SEND EMAIL NOTIFICATION
-        email_sent = send_email_notification(assessment_data)
+        # SEND NOTIFICATIONS (delivered in the background; failures go to the dead-letter log)
+        try:
+            notification_hub = load_notification_hub()
+            notification_hub.submit(assessment_data)
+            notifications_queued = bool(notification_hub.notifiers)
+        except Exception as e:
+            st.error(f"Failed to queue notifications: {str(e)}")
+            notifications_queued = False
         
-        # Save assessment data
-        json_file = "engineer_ai_assessments.json"
+        # Save assessment data (and live stats)
         try:
-            if os.path.exists(json_file):
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = [existing_data]
-            else:
-                existing_data = []
-            
-            existing_data.append(assessment_data)
-            
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, indent=2, ensure_ascii=False)
-                
+            save_assessment(assessment_data)
             success_message = True
         except Exception as e:
             success_message = True  # Still show results even if file save fails
         
         # Success message and personalized plan
-        if email_sent:
+        if notifications_queued:
             st.success(f"✅ Thank you, {name}! Your profile is under review and a plan will be sent to you at {email}.")
             st.balloons()
         else:
-            st.warning(f"✅ Thank you, {name}! Your assessment was recorded (but email notification failed - check logs).")
+            st.warning(f"✅ Thank you, {name}! Your assessment was recorded (but no notification was sent - check notification settings).")
         
         # Generate personalized recommendations
         st.markdown("---")
@@ -698,7 +595,62 @@ with st.sidebar:
             st.write(f"**Focus:** {info['focus']}")
             st.write(f"**Timeline:** {info['timeline']}")
             st.write(f"**Example:** {info['example']}")
-    
+
+    if admin_widget_enabled("show_stats"):
+        st.write("---")
+        st.subheader("📊 Assessment Stats")
+        try:
+            stats = load_stats()
+            st.metric("Total Assessments", stats["total"])
+            for label, histogram in [("Per Day", "by_day"),
+                                     ("By Discipline", "by_discipline"),
+                                     ("By Career Path", "by_use_case"),
+                                     ("By Urgency", "by_urgency"),
+                                     ("By Financial Runway", "by_runway")]:
+                with st.expander(label):
+                    st.dataframe(
+                        pd.Series(stats[histogram], name="Count").sort_index(),
+                        use_container_width=True
+                    )
+        except Exception as e:
+            st.error(f"Failed to load stats: {str(e)}")
+
+    if admin_widget_enabled("show_cohorts"):
+        st.write("---")
+        st.subheader("🐍 Py4AI Cohorts")
+        col1, col2 = st.columns(2)
+        with col1:
+            update_cohorts = st.button("Add New Applicants")
+        with col2:
+            regroup_cohorts = st.button("Regroup All")
+        try:
+            if update_cohorts or regroup_cohorts:
+                cohorts_state = run_cohort_grouping(rebuild=regroup_cohorts)
+            else:
+                cohorts_state = load_cohorts()
+            if cohorts_state and cohorts_state["cohorts"]:
+                roster = pd.DataFrame(
+                    cohort_roster(cohorts_state, load_json_list(ASSESSMENTS_FILE)),
+                    columns=["Cohort", "Name", "Email", "Location"]
+                )
+                st.dataframe(
+                    roster.groupby("Cohort").size().rename("Size"),
+                    use_container_width=True
+                )
+                for cohort_id, members in roster.groupby("Cohort"):
+                    with st.expander(f"{cohort_id} ({len(members)})"):
+                        st.dataframe(
+                            members.drop(columns="Cohort"),
+                            hide_index=True,
+                            use_container_width=True
+                        )
+            else:
+                st.write("No cohorts grouped yet.")
+        except ValueError as e:
+            st.error(f"{str(e)} (use Regroup All)")
+        except Exception as e:
+            st.error(f"Failed to group cohorts: {str(e)}")
+
     st.write("---")
     st.subheader("🚀 About Dr. C")
     st.write("""
@@ -0,0 +1,440 @@
+"""Multi-channel notification fan-out for completed assessments."""
+import asyncio
+import http.client
+import json
+import select
+import smtplib
+import ssl
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from urllib.parse import urlsplit
+
+NOTIFICATION_TIMEOUT = 10
+NOTIFICATION_POOL_SIZE = 2
+DEAD_LETTER_FILE = "engineer_ai_dead_letters.jsonl"
+
+# Delivery outcomes, as returned by NotificationHub and written to the dead-letter log.
+# Only FAILED entries are safe to replay; UNKNOWN ones may already have been delivered.
+DELIVERED = "delivered"
+FAILED = "failed"
+UNKNOWN = "unknown"
+DELIVERED_LATE = "delivered_late"
+
+class DeliveryOutcomeUnknown(Exception):
+    """The request reached the sink but no reliable answer came back"""
+
+def build_email_subject(assessment_data):
+    return f"🔧 New Engineer AI Pivot Assessment: {assessment_data['personal_info']['name']}"
+
+def build_email_body(assessment_data):
+    """Plain-text assessment report used by the email notifier"""
+    return f"""
+====================================
+ENGINEER AI PIVOT - NEW ASSESSMENT
+====================================
+
+CONTACT INFORMATION
+-----------------------------------
+Name:          {assessment_data['personal_info']['name']}
+Email:         {assessment_data['personal_info']['email']}
+LinkedIn:      {assessment_data['personal_info'].get('linkedin', 'Not provided')}
+Location:      {assessment_data['personal_info'].get('location', 'Not provided')}
+
+ENGINEERING BACKGROUND
+-----------------------------------
+Discipline:       {assessment_data['personal_info']['engineering_discipline']}
+Experience:       {assessment_data['personal_info']['years_experience']}
+Previous Title:   {assessment_data['personal_info']['previous_title']}
+Company/Industry: {assessment_data['personal_info']['company_industry']}
+
+CURRENT SITUATION
+-----------------------------------
+Layoff Timeline:     {assessment_data['personal_info']['layoff_date']}
+Financial Runway:    {assessment_data['personal_info']['financial_runway']}
+Employment Status:   {assessment_data['situation']['employment_status']}
+Job Timeline:        {assessment_data['situation']['job_timeline']}
+Urgency Level:       {assessment_data['situation']['urgency_level']}
+
+CAREER PATH
+-----------------------------------
+Selected Path: {assessment_data['use_case']['selected']}
+
+TECHNICAL BACKGROUND
+-----------------------------------
+Programming Exp:   {assessment_data['technical_background']['programming_exp']}
+Python Level:      {assessment_data['technical_background']['python_level']}
+Languages Known:   {', '.join(assessment_data['technical_background']['programming_languages'])}
+Data Analysis:     {assessment_data['technical_background']['data_analysis_exp']}
+Math Comfort:      {assessment_data['technical_background']['math_comfort']}
+
+AI KNOWLEDGE
+-----------------------------------
+AI Understanding:  {assessment_data['ai_knowledge']['ai_understanding']}
+AI Tools Used:     {', '.join(assessment_data['ai_knowledge']['ai_tools_used'])}
+AI Interests:      {', '.join(assessment_data['ai_knowledge']['ai_interests'])}
+Biggest Concern:   {assessment_data['ai_knowledge']['biggest_concern']}
+
+LEARNING PREFERENCES
+-----------------------------------
+Study Time:        {assessment_data['learning_preferences']['study_time']}
+Timeline:          {assessment_data['learning_preferences']['timeline_preference']}
+Learning Formats:  {', '.join(assessment_data['learning_preferences']['learning_formats'])}
+Video Preference:  {assessment_data['learning_preferences']['video_preference']}
+Hands-on Style:    {assessment_data['learning_preferences']['hands_on_style']}
+
+PY4AI INTEREST ⭐
+-----------------------------------
+Python AI Interest:  {assessment_data['py4ai_interest']['python_ai_interest']}
+Py4AI Course:        {assessment_data['py4ai_interest']['py4ai_course_interest']}
+
+CAREER GOALS
+-----------------------------------
+Motivation:          {assessment_data['career_goals']['pivot_motivation']}
+Target Roles:        {', '.join(assessment_data['career_goals']['target_roles'])}
+Income Expectations: {assessment_data['career_goals']['income_expectations']}
+Industry Target:     {assessment_data['career_goals']['industry_target']}
+
+RESOURCES
+-----------------------------------
+Learning Budget:     {assessment_data['resources']['learning_budget']}
+Equipment Status:    {assessment_data['resources']['equipment_status']}
+Home Environment:    {assessment_data['resources']['home_environment']}
+Family Support:      {assessment_data['resources']['family_support']}
+
+OPEN RESPONSES
+-----------------------------------
+Biggest Challenge:
+{assessment_data['open_responses']['biggest_challenge']}
+
+Most Exciting Opportunity:
+{assessment_data['open_responses']['most_exciting']}
+
+Ideal 12-Month Outcome:
+{assessment_data['open_responses']['ideal_outcome']}
+
+TIMESTAMP
+-----------------------------------
+{assessment_data['timestamp']}
+
+====================================
+FULL DATA (JSON)
+====================================
+{json.dumps(assessment_data, indent=2)}
+"""
+
+class Notifier(ABC):
+    """Base notification sink with a small pool of reusable connections.
+
+    Subclasses implement connect/disconnect/deliver as blocking calls; they run
+    on the sink's own thread pool so a slow sink only ties up its own workers.
+    """
+    name = "notifier"
+
+    def __init__(self, timeout=NOTIFICATION_TIMEOUT, pool_size=NOTIFICATION_POOL_SIZE):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f"notify-{self.name}")
+
+    def connect(self):
+        return None
+
+    def disconnect(self, conn):
+        pass
+
+    def connection_alive(self, conn):
+        """Cheap check, before reuse, that a pooled connection was not dropped while idle"""
+        return True
+
+    @abstractmethod
+    def deliver(self, conn, assessment_data):
+        """Send one assessment over conn; raise on failure"""
+
+    def _deliver_pooled(self, assessment_data):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is not None and not self.connection_alive(conn):
+            self.disconnect(conn)
+            conn = None
+        if conn is None:
+            conn = self.connect()
+        try:
+            self.deliver(conn, assessment_data)
+        except Exception:
+            self.disconnect(conn)
+            raise
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        self.disconnect(conn)
+
+    def submit(self, assessment_data):
+        """Start delivery on this sink's workers; returns a concurrent.futures.Future"""
+        return self._executor.submit(self._deliver_pooled, assessment_data)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self.disconnect(conn)
+        self._executor.shutdown(wait=False)
+
+class EmailNotifier(Notifier):
+    """Send the assessment report over SMTP (SSL by default, e.g. Gmail on 465).
+
+    Losing the connection once DATA is under way is reported as
+    DeliveryOutcomeUnknown, since the server may already have accepted it.
+
+    With use_ssl=False the connection is upgraded with STARTTLS whenever a
+    password is set (e.g. port 587); unauthenticated plain SMTP is only meant
+    for a local relay or test stand-in.
+    """
+
+    def __init__(self, sender, password, receiver, host="smtp.gmail.com", port=465,
+                 use_ssl=True, starttls=None, **kwargs):
+        if starttls is None:
+            starttls = bool(password) and not use_ssl
+        if password and not (use_ssl or starttls):
+            raise ValueError("Refusing to send SMTP credentials without SSL or STARTTLS")
+        self.name = f"email:{receiver}"
+        self.sender = sender
+        self.password = password
+        self.receiver = receiver
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        super().__init__(**kwargs)
+
+    def connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                      context=ssl.create_default_context())
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                server.starttls(context=ssl.create_default_context())
+        if self.password:
+            server.login(self.sender, self.password)
+        return server
+
+    def disconnect(self, conn):
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    def connection_alive(self, conn):
+        try:
+            return conn.noop()[0] == 250
+        except Exception:
+            return False
+
+    def deliver(self, conn, assessment_data):
+        msg = MIMEMultipart()
+        msg['From'] = self.sender
+        msg['To'] = self.receiver
+        msg['Subject'] = build_email_subject(assessment_data)
+        msg.attach(MIMEText(build_email_body(assessment_data), 'plain'))
+        conn.ehlo_or_helo_if_needed()
+        code, reply = conn.mail(self.sender)
+        if code != 250:
+            raise smtplib.SMTPSenderRefused(code, reply, self.sender)
+        code, reply = conn.rcpt(self.receiver)
+        if code not in (250, 251):
+            raise smtplib.SMTPRecipientsRefused({self.receiver: (code, reply)})
+        try:
+            code, reply = conn.data(msg.as_bytes(policy=msg.policy.clone(linesep='\r\n')))
+        except (smtplib.SMTPServerDisconnected, OSError) as e:
+            # The message may have been accepted before the reply was lost
+            raise DeliveryOutcomeUnknown(f"No reply after DATA: {type(e).__name__}: {e}") from e
+        if code != 250:
+            raise smtplib.SMTPDataError(code, reply)
+
+class WebhookNotifier(Notifier):
+    """POST the assessment as JSON (Slack-style "text" plus the full record).
+
+    POSTs are not idempotent, so a request is never re-sent: pooled connections
+    are checked before use, and a failure after the request went out is
+    reported as DeliveryOutcomeUnknown.
+    """
+
+    def __init__(self, url, headers=None, name=None, **kwargs):
+        parts = urlsplit(url)
+        # Host only by default: Slack-style webhook paths embed secrets
+        self.name = name or f"webhook:{parts.netloc}"
+        self.url = url
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        super().__init__(**kwargs)
+
+    def connect(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.netloc, timeout=self.timeout)
+
+    def disconnect(self, conn):
+        conn.close()
+
+    def connection_alive(self, conn):
+        if conn.sock is None:
+            return True
+        # An idle keep-alive socket is only readable once the server has closed it
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+        return not readable
+
+    def deliver(self, conn, assessment_data):
+        payload = {
+            "text": f"{build_email_subject(assessment_data)} "
+                    f"({assessment_data['personal_info']['engineering_discipline']}, "
+                    f"{assessment_data['use_case']['selected']})",
+            "assessment": assessment_data,
+        }
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        conn.request("POST", self.path, body=body, headers=self.headers)
+        try:
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise DeliveryOutcomeUnknown(f"No response after POST: {type(e).__name__}: {e}") from e
+        if response.status >= 300:
+            raise RuntimeError(f"Webhook returned HTTP {response.status} {response.reason}")
+
+class FileNotifier(Notifier):
+    """Append each assessment as one JSON line to a local file"""
+
+    def __init__(self, path, **kwargs):
+        self.name = f"file:{path}"
+        self.path = path
+        kwargs.setdefault("pool_size", 1)
+        super().__init__(**kwargs)
+
+    def deliver(self, conn, assessment_data):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(assessment_data, ensure_ascii=False) + "\n")
+
+class NotificationHub:
+    """Fan each assessment out to every notifier concurrently.
+
+    Deliveries run on a private asyncio loop in a background thread, so
+    submit() returns immediately. Anything not delivered is appended to the
+    dead-letter log with its status; a delivery that outlives its timeout is
+    logged as UNKNOWN and its eventual outcome is logged under the same
+    delivery_id once the worker finishes.
+    """
+
+    def __init__(self, notifiers, dead_letter_file=DEAD_LETTER_FILE):
+        self.notifiers = notifiers
+        self.dead_letter_file = dead_letter_file
+        self._dead_letter_lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="notification-hub", daemon=True)
+        self._thread.start()
+
+    def submit(self, assessment_data):
+        """Queue delivery; returns a concurrent.futures.Future of {sink name: status}"""
+        return asyncio.run_coroutine_threadsafe(self.fan_out(assessment_data), self._loop)
+
+    async def fan_out(self, assessment_data):
+        results = await asyncio.gather(
+            *(self._deliver(notifier, assessment_data) for notifier in self.notifiers)
+        )
+        return {notifier.name: status for notifier, status in zip(self.notifiers, results)}
+
+    async def _deliver(self, notifier, assessment_data):
+        delivery_id = uuid.uuid4().hex
+        worker = notifier.submit(assessment_data)
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(worker)), notifier.timeout)
+        except Exception:
+            pass
+        if not worker.done() and worker.cancel():
+            # Still queued behind busy workers: nothing was sent, so it is safe to replay
+            self._dead_letter(notifier, delivery_id, FAILED, "Timed out before delivery started",
+                              assessment_data)
+            return FAILED
+        if not worker.done():
+            # Already running: it may yet succeed, so this must not be replayed blindly
+            self._dead_letter(notifier, delivery_id, UNKNOWN, "Timed out waiting for delivery",
+                              assessment_data)
+            worker.add_done_callback(
+                lambda future: self._late_outcome(notifier, delivery_id, future)
+            )
+            return UNKNOWN
+        error = worker.exception()
+        if error is None:
+            return DELIVERED
+        status = UNKNOWN if isinstance(error, DeliveryOutcomeUnknown) else FAILED
+        self._dead_letter(notifier, delivery_id, status, error, assessment_data)
+        return status
+
+    def _late_outcome(self, notifier, delivery_id, future):
+        error = future.exception()
+        if error is None:
+            self._dead_letter(notifier, delivery_id, DELIVERED_LATE, None)
+        else:
+            status = UNKNOWN if isinstance(error, DeliveryOutcomeUnknown) else FAILED
+            self._dead_letter(notifier, delivery_id, status, error)
+
+    def _dead_letter(self, notifier, delivery_id, status, error, assessment_data=None):
+        if isinstance(error, BaseException):
+            error = f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "delivery_id": delivery_id,
+            "sink": notifier.name,
+            "status": status,
+            "error": error,
+        }
+        if assessment_data is not None:
+            entry["assessment"] = assessment_data
+        with self._dead_letter_lock:
+            with open(self.dead_letter_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=NOTIFICATION_TIMEOUT)
+        for notifier in self.notifiers:
+            notifier.close()
+
+def build_notifiers(email_settings, notification_settings):
+    """Configure sinks from the [email] and [notifications] settings; unset sinks are skipped.
+
+    email:          sender, password, receiver (optional smtp_host, smtp_port, use_ssl, starttls)
+    notifications:  webhook_urls, webhook_headers, file, timeout
+    """
+    timeout = notification_settings.get("timeout", NOTIFICATION_TIMEOUT)
+    notifiers = []
+    if email_settings.get("receiver"):
+        notifiers.append(EmailNotifier(
+            sender=email_settings.get("sender"),
+            password=email_settings.get("password"),
+            receiver=email_settings["receiver"],
+            host=email_settings.get("smtp_host", "smtp.gmail.com"),
+            port=email_settings.get("smtp_port", 465),
+            use_ssl=email_settings.get("use_ssl", True),
+            starttls=email_settings.get("starttls"),
+            timeout=timeout
+        ))
+    webhook_urls = notification_settings.get("webhook_urls", [])
+    if isinstance(webhook_urls, str):
+        webhook_urls = [webhook_urls]
+    elif not isinstance(webhook_urls, (list, tuple)):
+        raise ValueError("notifications.webhook_urls must be a URL or a list of URLs")
+    for i, url in enumerate(webhook_urls, start=1):
+        notifiers.append(WebhookNotifier(
+            url, headers=dict(notification_settings.get("webhook_headers", {})),
+            name=f"webhook-{i}:{urlsplit(url).netloc}", timeout=timeout
+        ))
+    if notification_settings.get("file"):
+        notifiers.append(FileNotifier(notification_settings["file"], timeout=timeout))
+    return notifiers
@@ -0,0 +1,134 @@
+"""Assessment archive and materialized live stats."""
+import json
+import os
+import tempfile
+import threading
+
+ASSESSMENTS_FILE = "engineer_ai_assessments.json"
+STATS_FILE = "engineer_ai_stats.json"
+
+# Histogram name -> (section, field) in the assessment record
+STATS_HISTOGRAMS = {
+    "by_discipline": ("personal_info", "engineering_discipline"),
+    "by_use_case": ("use_case", "selected"),
+    "by_urgency": ("situation", "urgency_level"),
+    "by_runway": ("personal_info", "financial_runway"),
+}
+
+# Streamlit runs each session on its own thread; every read-modify-write of
+# the archive and stats goes through this lock
+STORAGE_LOCK = threading.RLock()
+
+def empty_stats():
+    """Return a zeroed stats summary"""
+    stats = {"total": 0, "archive": None, "by_day": {}}
+    for histogram in STATS_HISTOGRAMS:
+        stats[histogram] = {}
+    return stats
+
+def update_stats(stats, assessment_data):
+    """Fold one assessment into the running counters and histograms"""
+    stats["total"] += 1
+    day = assessment_data.get('timestamp', '')[:10] or "Unknown"
+    stats["by_day"][day] = stats["by_day"].get(day, 0) + 1
+    for histogram, (section, field) in STATS_HISTOGRAMS.items():
+        value = (assessment_data.get(section) or {}).get(field) or "Unknown"
+        stats[histogram][value] = stats[histogram].get(value, 0) + 1
+    return stats
+
+def rebuild_stats(assessments):
+    """Recompute the stats summary from scratch over the full archive"""
+    stats = empty_stats()
+    for assessment_data in assessments:
+        update_stats(stats, assessment_data)
+    return stats
+
+def archive_signature(path=ASSESSMENTS_FILE):
+    """Cheap (size, mtime) fingerprint of the archive, or None if it does not exist"""
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [info.st_size, info.st_mtime_ns]
+
+def stats_in_step(stats, signature):
+    """True if stats has the current shape and was built from this archive version"""
+    if not isinstance(stats, dict) or set(stats) != set(empty_stats()):
+        return False
+    if not isinstance(stats["total"], int):
+        return False
+    if any(not isinstance(stats[key], dict) for key in ["by_day", *STATS_HISTOGRAMS]):
+        return False
+    return stats["archive"] == signature
+
+def load_json_list(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+def write_json_atomic(path, data):
+    """Write JSON to a unique temp file next to path, then swap it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _read_stats():
+    try:
+        with open(STATS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _refresh_stats(assessments):
+    stats = rebuild_stats(assessments)
+    stats["archive"] = archive_signature()
+    write_json_atomic(STATS_FILE, stats)
+    return stats
+
+def load_stats():
+    """Read the materialized stats summary without scanning the archive.
+
+    Only a stat() of the archive is needed to confirm the summary is current;
+    if it is missing, malformed or was built from a different archive version
+    (e.g. a crash between the two writes in save_assessment) it is rebuilt once.
+    """
+    with STORAGE_LOCK:
+        stats = _read_stats()
+        if stats_in_step(stats, archive_signature()):
+            return stats
+        return _refresh_stats(load_json_list(ASSESSMENTS_FILE))
+
+def save_assessment(assessment_data):
+    """Append an assessment to the archive, then fold it into the stats.
+
+    The archive write always comes first and a stats failure never undoes it:
+    the summary records which archive version it describes, so if it falls
+    behind, load_stats() rebuilds it.
+    """
+    with STORAGE_LOCK:
+        existing_data = load_json_list(ASSESSMENTS_FILE)
+        stats = _read_stats()
+        if not stats_in_step(stats, archive_signature()):
+            stats = None
+
+        existing_data.append(assessment_data)
+        write_json_atomic(ASSESSMENTS_FILE, existing_data)
+
+        try:
+            if stats is None:
+                return _refresh_stats(existing_data)
+            update_stats(stats, assessment_data)
+            stats["archive"] = archive_signature()
+            write_json_atomic(STATS_FILE, stats)
+            return stats
+        except Exception:
+            return None
@@ -0,0 +1,93 @@
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_ASSESSMENT = {
+    "timestamp": "2025-10-02T09:37:35.615622",
+    "personal_info": {
+        "name": "Test Engineer",
+        "email": "test@example.com",
+        "linkedin": "",
+        "location": "Dallas, TX",
+        "engineering_discipline": "Mechanical",
+        "years_experience": "10-15 years",
+        "previous_title": "Senior Mechanical Engineer",
+        "company_industry": "Aerospace",
+        "layoff_date": "Currently employed",
+        "financial_runway": "3-6 months"
+    },
+    "situation": {
+        "employment_status": "Exploring options",
+        "job_timeline": "Within 3 months",
+        "urgency_level": "Committed to pivot",
+        "geographic_flexibility": "Must stay local",
+        "industry_pivot": "Adjacent industry"
+    },
+    "use_case": {"selected": "Apply AI to Data Analysis", "details": None},
+    "technical_background": {
+        "programming_exp": "Some programming",
+        "programming_languages": ["MATLAB"],
+        "python_level": "Basic scripts",
+        "data_analysis_exp": "Excel only",
+        "math_comfort": "Comfortable",
+        "learning_preference": "Hands-on projects"
+    },
+    "ai_knowledge": {
+        "ai_understanding": "Heard buzzwords",
+        "ai_tools_used": ["ChatGPT"],
+        "ai_interests": ["Predictive maintenance"],
+        "biggest_concern": "Not sure where to start"
+    },
+    "learning_preferences": {
+        "study_time": "5-10 hours",
+        "learning_formats": ["Video tutorials"],
+        "timeline_preference": "6-Month Strategic",
+        "audio_context": [],
+        "video_preference": "Short clips (<10min)",
+        "hands_on_style": "Project-based"
+    },
+    "career_goals": {
+        "pivot_motivation": "Career growth",
+        "target_roles": ["Data analyst/scientist"],
+        "income_expectations": "Maintain similar level",
+        "industry_target": "Manufacturing",
+        "role_preference": "Individual contributor"
+    },
+    "resources": {
+        "learning_budget": "$100-500",
+        "equipment_status": "Basic setup ok",
+        "home_environment": "Adequate",
+        "family_support": "Supportive"
+    },
+    "py4ai_interest": {
+        "python_ai_interest": "Definitely want to learn",
+        "py4ai_course_interest": "Would definitely take"
+    },
+    "open_responses": {
+        "strengths": "",
+        "areas_to_develop": "",
+        "biggest_challenge": "",
+        "most_exciting": "",
+        "ideal_outcome": ""
+    }
+}
+
+@pytest.fixture
+def make_assessment():
+    """Build a sample assessment, overriding fields as {section: {field: value}}"""
+    def _make(**sections):
+        assessment_data = copy.deepcopy(SAMPLE_ASSESSMENT)
+        for section, fields in sections.items():
+            assessment_data[section].update(fields)
+        return assessment_data
+    return _make
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory so the relative data files are isolated"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
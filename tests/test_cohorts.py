@@ -0,0 +1,139 @@
+import itertools
+import threading
+
+import pytest
+
+import cohorts
+import storage
+
+def make_applicants(make_assessment, count, start=0):
+    """Applicants cycling through every combination of the grouped answers"""
+    answers = itertools.cycle(itertools.product(
+        cohorts.PYTHON_AI_INTEREST_OPTIONS,
+        cohorts.TIMELINE_PREFERENCE_OPTIONS,
+        cohorts.STUDY_TIME_OPTIONS,
+        cohorts.PYTHON_LEVEL_OPTIONS,
+        ["Dallas, TX", "Seattle", ""],
+    ))
+    applicants = []
+    for i, (interest, timeline, study_time, python_level, location) in zip(range(start, start + count), answers):
+        applicants.append(make_assessment(
+            personal_info={"email": f"applicant{i}@example.com", "location": location},
+            py4ai_interest={"python_ai_interest": interest},
+            learning_preferences={"timeline_preference": timeline, "study_time": study_time},
+            technical_background={"python_level": python_level},
+        ))
+    return applicants
+
+def membership(state):
+    return {key: cohort["id"] for cohort in state["cohorts"] for key in cohort["members"]}
+
+def test_cohort_sizes_stay_within_target(make_assessment):
+    state = cohorts.assign_cohorts(make_applicants(make_assessment, 1000), target_size=25)
+
+    sizes = [len(cohort["members"]) for cohort in state["cohorts"]]
+    assert sum(sizes) == 1000
+    assert max(sizes) <= 25
+    assert len(state["cohorts"]) == 40
+
+def test_rerun_keeps_existing_members_in_their_cohort(make_assessment):
+    applicants = make_applicants(make_assessment, 120)
+    state = cohorts.assign_cohorts(applicants, target_size=25)
+    before = membership(state)
+
+    state = cohorts.assign_cohorts(applicants + make_applicants(make_assessment, 80, start=120), state, target_size=25)
+    after = membership(state)
+
+    assert len(after) == 200
+    assert all(after[key] == cohort_id for key, cohort_id in before.items())
+    assert max(len(cohort["members"]) for cohort in state["cohorts"]) <= 25
+    assert len({cohort["id"] for cohort in state["cohorts"]}) == len(state["cohorts"])
+
+def test_resubmissions_are_deduplicated(make_assessment):
+    first = make_assessment(personal_info={"email": "Repeat@Example.com"})
+    again = make_assessment(personal_info={"email": "repeat@example.com "},
+                            technical_background={"python_level": "Advanced"})
+
+    state = cohorts.assign_cohorts([first, again, make_assessment(personal_info={"email": "other@example.com"})])
+
+    assert sorted(membership(state)) == ["other@example.com", "repeat@example.com"]
+
+def test_target_size_change_requires_rebuild(make_assessment):
+    state = cohorts.assign_cohorts(make_applicants(make_assessment, 30), target_size=25)
+
+    with pytest.raises(ValueError):
+        cohorts.assign_cohorts(make_applicants(make_assessment, 30), state, target_size=10)
+
+def test_run_cohort_grouping_is_incremental_and_persisted(workdir, make_assessment):
+    for assessment_data in make_applicants(make_assessment, 30):
+        storage.save_assessment(assessment_data)
+    before = membership(cohorts.run_cohort_grouping())
+
+    for assessment_data in make_applicants(make_assessment, 10, start=30):
+        storage.save_assessment(assessment_data)
+    with pytest.raises(ValueError):
+        cohorts.run_cohort_grouping(target_size=10)
+    state = cohorts.load_cohorts()
+
+    assert membership(state) == before
+    after = membership(cohorts.run_cohort_grouping())
+    assert len(after) == 40
+    assert all(after[key] == cohort_id for key, cohort_id in before.items())
+    assert len(membership(cohorts.run_cohort_grouping(rebuild=True, target_size=10))) == 40
+
+def test_cohort_roster_lists_members_by_name(make_assessment):
+    applicants = [make_assessment(personal_info={"name": "Ada", "email": "ada@example.com"})]
+
+    state = cohorts.assign_cohorts(applicants)
+
+    assert cohorts.cohort_roster(state, applicants) == [
+        (state["cohorts"][0]["id"], "Ada", "ada@example.com", "Dallas, TX")
+    ]
+
+def test_identical_applicants_are_split_into_full_cohorts(make_assessment):
+    applicants = [make_assessment(personal_info={"email": f"twin{i}@example.com"}) for i in range(510)]
+
+    state = cohorts.assign_cohorts(applicants, target_size=25)
+
+    sizes = sorted(len(cohort["members"]) for cohort in state["cohorts"])
+    assert sum(sizes) == 510
+    assert max(sizes) <= 25
+
+def test_grouping_run_does_not_block_submissions(workdir, make_assessment, monkeypatch):
+    storage.save_assessment(make_assessment())
+    grouping_started = threading.Event()
+    release_grouping = threading.Event()
+    assign_cohorts = cohorts.assign_cohorts
+
+    def slow_assign(*args, **kwargs):
+        grouping_started.set()
+        release_grouping.wait(timeout=5)
+        return assign_cohorts(*args, **kwargs)
+
+    monkeypatch.setattr(cohorts, "assign_cohorts", slow_assign)
+    grouping = threading.Thread(target=cohorts.run_cohort_grouping)
+    grouping.start()
+    assert grouping_started.wait(timeout=5)
+
+    saver = threading.Thread(target=storage.save_assessment,
+                             args=(make_assessment(personal_info={"email": "late@example.com"}),))
+    saver.start()
+    saver.join(timeout=2)
+    saved_while_grouping = not saver.is_alive()
+    release_grouping.set()
+    grouping.join(timeout=5)
+
+    assert saved_while_grouping
+    assert len(storage.load_json_list(storage.ASSESSMENTS_FILE)) == 2
+
+def test_applicants_without_email_or_timestamp_stay_distinct(make_assessment):
+    no_email = make_assessment(personal_info={"email": None})
+    anonymous = [make_assessment(personal_info={"email": None, "name": name}) for name in ["Ada", "Grace"]]
+    for assessment_data in anonymous:
+        assessment_data["timestamp"] = ""
+
+    state = cohorts.assign_cohorts([no_email, *anonymous])
+
+    keys = membership(state)
+    assert len(keys) == 3
+    assert no_email["timestamp"] in keys
@@ -0,0 +1,250 @@
+import email
+import http.server
+import json
+import socketserver
+import threading
+import time
+
+import pytest
+
+import notifications
+
+class WebhookStandIn(http.server.BaseHTTPRequestHandler):
+    """/hook answers at once, /slow after a delay, /fail with HTTP 500, /drop then closes the socket"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.posts.append((self.path, payload))
+        self.server.clients.add(self.client_address)
+        if self.path == "/slow":
+            time.sleep(self.server.slow_delay)
+        self.send_response(500 if self.path == "/fail" else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        if self.path == "/drop":
+            # Close the keep-alive connection without announcing it
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+class SMTPStandIn(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages without TLS or authentication"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+        self.wfile.flush()
+
+    def handle(self):
+        self.reply("220 stand-in ready")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split()[0].upper()
+            if command == "DATA":
+                self.reply("354 end with .")
+                lines = []
+                while (data := self.rfile.readline().decode()) != ".\r\n":
+                    lines.append(data)
+                self.server.messages.append("".join(lines))
+                if self.server.drop_after_data:
+                    return
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+@pytest.fixture
+def webhook_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), WebhookStandIn)
+    server.daemon_threads = True
+    server.posts = []
+    server.clients = set()
+    server.slow_delay = 1.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPStandIn)
+    server.daemon_threads = True
+    server.messages = []
+    server.drop_after_data = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+@pytest.fixture
+def make_hub(workdir):
+    hubs = []
+
+    def _make(notifiers):
+        hub = notifications.NotificationHub(notifiers, dead_letter_file="dead_letters.jsonl")
+        hubs.append(hub)
+        return hub
+    yield _make
+    for hub in hubs:
+        hub.close()
+
+def read_dead_letters():
+    try:
+        with open("dead_letters.jsonl", encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+def test_hub_fans_out_to_every_sink(make_hub, make_assessment, webhook_server, smtp_server):
+    hub = make_hub([
+        notifications.EmailNotifier("app@example.com", None, "admin@example.com", host="127.0.0.1",
+                                    port=smtp_server.server_address[1], use_ssl=False, timeout=5),
+        notifications.WebhookNotifier(f"{webhook_server.url}/hook", name="hook", timeout=5),
+        notifications.WebhookNotifier(f"{webhook_server.url}/fail", name="fail", timeout=5),
+        notifications.FileNotifier("notifications.jsonl", timeout=5),
+    ])
+
+    results = hub.submit(make_assessment()).result(timeout=10)
+
+    assert results == {
+        "email:admin@example.com": notifications.DELIVERED,
+        "hook": notifications.DELIVERED,
+        "fail": notifications.FAILED,
+        "file:notifications.jsonl": notifications.DELIVERED,
+    }
+    assert len(smtp_server.messages) == 1
+    message = email.message_from_string(smtp_server.messages[0])
+    assert "Test Engineer" in message.get_payload()[0].get_payload(decode=True).decode('utf-8')
+    hook_posts = [payload for path, payload in webhook_server.posts if path == "/hook"]
+    assert hook_posts[0]["assessment"]["personal_info"]["email"] == "test@example.com"
+    with open("notifications.jsonl", encoding='utf-8') as f:
+        assert len(f.readlines()) == 1
+    [dead_letter] = read_dead_letters()
+    assert dead_letter["sink"] == "fail"
+    assert dead_letter["status"] == notifications.FAILED
+    assert "HTTP 500" in dead_letter["error"]
+    assert dead_letter["assessment"]["personal_info"]["name"] == "Test Engineer"
+
+def test_slow_sink_does_not_hold_up_others(make_hub, make_assessment, webhook_server):
+    hub = make_hub([
+        notifications.WebhookNotifier(f"{webhook_server.url}/slow", name="slow", timeout=0.2),
+        notifications.WebhookNotifier(f"{webhook_server.url}/hook", name="hook", timeout=5),
+    ])
+
+    started = time.monotonic()
+    future = hub.submit(make_assessment())
+    assert time.monotonic() - started < 0.1
+    results = future.result(timeout=5)
+
+    assert time.monotonic() - started < webhook_server.slow_delay
+    assert results == {"slow": notifications.UNKNOWN, "hook": notifications.DELIVERED}
+
+    # The slow POST was sent once and is never marked as safe to replay
+    time.sleep(webhook_server.slow_delay)
+    assert [path for path, _ in webhook_server.posts].count("/slow") == 1
+    statuses = {dead_letter["status"] for dead_letter in read_dead_letters()}
+    assert statuses <= {notifications.UNKNOWN, notifications.DELIVERED_LATE}
+
+def test_late_outcome_is_logged_under_same_delivery_id(make_hub, make_assessment):
+    class SlowNotifier(notifications.Notifier):
+        name = "slow"
+
+        def deliver(self, conn, assessment_data):
+            time.sleep(0.5)
+
+    hub = make_hub([SlowNotifier(timeout=0.1)])
+
+    assert hub.submit(make_assessment()).result(timeout=5) == {"slow": notifications.UNKNOWN}
+
+    deadline = time.monotonic() + 5
+    while len(read_dead_letters()) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    timed_out, late = read_dead_letters()
+    assert timed_out["status"] == notifications.UNKNOWN
+    assert timed_out["assessment"]["personal_info"]["name"] == "Test Engineer"
+    assert late["status"] == notifications.DELIVERED_LATE
+    assert late["delivery_id"] == timed_out["delivery_id"]
+
+def test_queued_delivery_that_times_out_is_failed_not_unknown(make_hub, make_assessment):
+    started = []
+
+    class BusyNotifier(notifications.Notifier):
+        name = "busy"
+
+        def deliver(self, conn, assessment_data):
+            started.append(assessment_data["personal_info"]["email"])
+            time.sleep(0.5)
+
+    hub = make_hub([BusyNotifier(timeout=0.75, pool_size=1)])
+
+    futures = [hub.submit(make_assessment(personal_info={"email": f"{i}@example.com"})) for i in range(3)]
+    results = [future.result(timeout=5)["busy"] for future in futures]
+    time.sleep(0.75)
+
+    assert results == [notifications.DELIVERED, notifications.UNKNOWN, notifications.FAILED]
+    assert started == ["0@example.com", "1@example.com"]
+    statuses = {dead_letter["assessment"]["personal_info"]["email"]: dead_letter["status"]
+                for dead_letter in read_dead_letters() if "assessment" in dead_letter}
+    assert statuses == {"1@example.com": notifications.UNKNOWN, "2@example.com": notifications.FAILED}
+
+def test_smtp_disconnect_after_data_is_unknown(make_hub, make_assessment, smtp_server):
+    smtp_server.drop_after_data = True
+    hub = make_hub([
+        notifications.EmailNotifier("app@example.com", None, "admin@example.com", host="127.0.0.1",
+                                    port=smtp_server.server_address[1], use_ssl=False, timeout=5),
+    ])
+
+    results = hub.submit(make_assessment()).result(timeout=10)
+
+    assert results == {"email:admin@example.com": notifications.UNKNOWN}
+    assert len(smtp_server.messages) == 1
+    [dead_letter] = read_dead_letters()
+    assert dead_letter["status"] == notifications.UNKNOWN
+
+def test_webhook_reuses_pooled_connection(make_hub, make_assessment, webhook_server):
+    hub = make_hub([notifications.WebhookNotifier(f"{webhook_server.url}/hook", timeout=5)])
+
+    for _ in range(3):
+        hub.submit(make_assessment()).result(timeout=5)
+
+    assert len(webhook_server.posts) == 3
+    assert len(webhook_server.clients) == 1
+
+def test_dropped_pooled_connection_is_replaced_without_resending(make_hub, make_assessment, webhook_server):
+    hub = make_hub([notifications.WebhookNotifier(f"{webhook_server.url}/drop", name="drop", timeout=5)])
+
+    first = hub.submit(make_assessment()).result(timeout=5)
+    time.sleep(0.1)
+    second = hub.submit(make_assessment()).result(timeout=5)
+
+    assert first == second == {"drop": notifications.DELIVERED}
+    assert len(webhook_server.posts) == 2
+    assert read_dead_letters() == []
+
+def test_email_credentials_require_tls():
+    with pytest.raises(ValueError):
+        notifications.EmailNotifier("app@example.com", "secret", "admin@example.com",
+                                    port=587, use_ssl=False, starttls=False)
+
+    notifier = notifications.EmailNotifier("app@example.com", "secret", "admin@example.com",
+                                           port=587, use_ssl=False)
+    assert notifier.starttls
+    notifier.close()
+
+def test_build_notifiers_accepts_single_webhook_url():
+    notifiers = notifications.build_notifiers({}, {"webhook_urls": "https://hooks.example.com/T0/B0/secret"})
+
+    assert [notifier.name for notifier in notifiers] == ["webhook-1:hooks.example.com"]
+    with pytest.raises(ValueError):
+        notifications.build_notifiers({}, {"webhook_urls": 42})
+
+def test_notifier_must_implement_deliver():
+    class Incomplete(notifications.Notifier):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,56 @@
+import json
+import threading
+
+import storage
+
+def test_save_updates_archive_and_stats(workdir, make_assessment):
+    storage.save_assessment(make_assessment())
+    storage.save_assessment(make_assessment(personal_info={"engineering_discipline": "Civil"}))
+
+    assert len(storage.load_json_list(storage.ASSESSMENTS_FILE)) == 2
+    stats = storage.load_stats()
+    assert stats["total"] == 2
+    assert stats["by_day"] == {"2025-10-02": 2}
+    assert stats["by_discipline"] == {"Mechanical": 1, "Civil": 1}
+    assert stats["by_runway"] == {"3-6 months": 2}
+
+def test_malformed_stats_are_rebuilt_and_archive_still_written(workdir, make_assessment):
+    storage.save_assessment(make_assessment())
+    with open(storage.STATS_FILE, encoding='utf-8') as f:
+        stats = json.load(f)
+    del stats["by_runway"]
+    with open(storage.STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(stats, f)
+
+    stats = storage.save_assessment(make_assessment())
+
+    assert len(storage.load_json_list(storage.ASSESSMENTS_FILE)) == 2
+    assert stats["by_runway"] == {"3-6 months": 2}
+
+def test_load_stats_rebuilds_when_out_of_step_with_archive(workdir, make_assessment):
+    storage.save_assessment(make_assessment())
+    # Simulate a crash between the archive write and the stats write
+    storage.write_json_atomic(storage.ASSESSMENTS_FILE, [make_assessment()] * 3)
+
+    assert storage.load_stats()["total"] == 3
+
+def test_concurrent_saves_keep_every_record(workdir, make_assessment):
+    errors = []
+
+    def worker(thread_id):
+        for i in range(20):
+            try:
+                storage.save_assessment(make_assessment(personal_info={"email": f"{thread_id}-{i}@example.com"}))
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(storage.load_json_list(storage.ASSESSMENTS_FILE)) == 80
+    assert storage.load_stats()["total"] == 80
+    assert list(workdir.glob("*.tmp")) == []